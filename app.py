@@ -5,51 +5,84 @@ Student Management System (Tkinter + PyMySQL)
 Requirements:
 - Python 3.11.9
 - PyMySQL
+- DBUtils
 - MySQL 8.0.43
 - Windows 11 (tested visually)
 
 Files:
 - config.py : DB credentials (edit if needed)
 - db_init.py : helper to run init.sql to create DB & seed data
+- db_pool.py : shared connection pool
 - app.py : this GUI application
 """
 
 import os
 import re
 import csv
+import gzip
 import datetime
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import pymysql
 import config
+from db_pool import get_conn, release
 
 DB = None
 
 def get_db_connection(db=True):
     """Return a PyMySQL connection using config.py settings.
+       Leases from the shared pool; release(conn) returns it.
        If db=False, do not specify database (used for initial DB setup).
     """
-    kwargs = {
-        'host': config.DB_HOST,
-        'user': config.DB_USER,
-        'password': config.DB_PASS,
-        'port': config.DB_PORT,
-        'cursorclass': pymysql.cursors.DictCursor,
-        'autocommit': True
-    }
     if db:
-        kwargs['db'] = config.DB_NAME
-    return pymysql.connect(**kwargs)
+        return get_conn()
+    return pymysql.connect(host=config.DB_HOST, user=config.DB_USER, password=config.DB_PASS,
+                           port=config.DB_PORT, cursorclass=pymysql.cursors.DictCursor, autocommit=True)
 
 # Validation helpers
+# India specific: 10 digits, starts with 6-9
+_PHONE_RE = re.compile(r'^(?:\+91|91)?[6-9]\d{9}$')
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
 def valid_phone(phone):
-    # India specific: 10 digits, starts with 6-9
-    return bool(re.fullmatch(r'^(?:\+91|91)?[6-9]\d{9}$', phone.strip()))
+    return bool(_PHONE_RE.fullmatch(phone.strip()))
 
 def valid_email(email):
-     return bool(re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", email.strip()))
+    return bool(_EMAIL_RE.fullmatch(email.strip()))
 
 # Database access functions (all parameterized)
+def _stream(sql, params=(), batch_size=500):
+    """Yield rows from a server-side (unbuffered) cursor, batch_size at a time,
+       so large results are never fully materialized in memory.
+    """
+    conn = get_db_connection()
+    try:
+        with conn.cursor(pymysql.cursors.SSDictCursor) as cur:
+            cur.execute(sql, params)
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield from batch
+    finally:
+        release(conn)
+
+def _fetchall(sql, params=(), cur=None, cursorclass=None):
+    """Run a SELECT on cur if given (a tab's long-lived cursor), else on a pooled connection."""
+    if cur is not None:
+        cur.execute(sql, params)
+        return cur.fetchall()
+    conn = get_db_connection()
+    try:
+        with conn.cursor(cursorclass) if cursorclass else conn.cursor() as c:
+            c.execute(sql, params)
+            return c.fetchall()
+    finally:
+        release(conn)
+
 def create_student(data):
     sql = """INSERT INTO students (roll_no, first_name, last_name, gender, dob, phone, email, address_line)
              VALUES (%s,%s,%s,%s,%s,%s,%s,%s)"""
@@ -62,7 +95,7 @@ def create_student(data):
             ))
             return cur.lastrowid
     finally:
-        conn.close()
+        release(conn)
 
 def update_student(student_id, data):
     sql = """UPDATE students SET roll_no=%s, first_name=%s, last_name=%s, gender=%s, dob=%s,
@@ -77,7 +110,8 @@ def update_student(student_id, data):
             ))
             return cur.rowcount
     finally:
-        conn.close()
+        release(conn)
+        _invalidate_enrollments()
 
 def delete_student(student_id):
     conn = get_db_connection()
@@ -86,28 +120,63 @@ def delete_student(student_id):
             cur.execute("DELETE FROM students WHERE student_id=%s", (student_id,))
             return cur.rowcount
     finally:
-        conn.close()
-
-def search_students(q, page=1, page_size=25):
+        release(conn)
+        _invalidate_enrollments()
+
+_SEARCH_COLUMNS = ('roll_no', 'first_name', 'last_name', 'phone', 'email')
+# Columns rendered by StudentsTab, in Treeview order
+_STUDENT_KEYS = ('student_id','roll_no','first_name','last_name','gender','dob','phone','email','address_line')
+# Projection that yields display-ready tuples (NULL -> '') straight from the server
+_STUDENT_COLS = "s.student_id, s.roll_no, s.first_name, IFNULL(s.last_name,''), IFNULL(s.gender,''), IFNULL(s.dob,''), IFNULL(s.phone,''), IFNULL(s.email,''), IFNULL(s.address_line,'')"
+
+def search_students(q, page=1, page_size=25, mode='contains', cur=None):
+    """Page through students matching q; rows are tuples in _STUDENT_KEYS order.
+       cur, if given, must be a tuple (non-dict) cursor.
+       mode='contains' matches anywhere (full scan); mode='prefix' matches the start of
+       each column, run as a UNION of per-column prefix queries so each can use its index.
+    """
     offset = (page-1)*page_size
-    qlike = f"%{q}%"
-    sql = """SELECT * FROM students
-             WHERE roll_no LIKE %s OR first_name LIKE %s OR last_name LIKE %s OR phone LIKE %s OR email LIKE %s
-             ORDER BY created_at DESC
-             LIMIT %s OFFSET %s"""
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql, (qlike, qlike, qlike, qlike, qlike, page_size, offset))
-            results = cur.fetchall()
-            # count
-            cur.execute("SELECT COUNT(*) as cnt FROM students WHERE roll_no LIKE %s OR first_name LIKE %s OR last_name LIKE %s OR phone LIKE %s OR email LIKE %s", (qlike, qlike, qlike, qlike, qlike))
-            total = cur.fetchone()['cnt']
-            return results, total
-    finally:
-        conn.close()
+    if mode == 'prefix':
+        qlike = f"{q}%"
+        # UNION (not UNION ALL) dedupes server-side so LIMIT/OFFSET stay correct
+        matches = " UNION ".join(f"SELECT student_id FROM students WHERE {c} LIKE %s" for c in _SEARCH_COLUMNS)
+        sql = f"""SELECT {_STUDENT_COLS}, COUNT(*) OVER() FROM students s
+                  JOIN ({matches}) m ON m.student_id=s.student_id
+                  ORDER BY s.created_at DESC
+                  LIMIT %s OFFSET %s"""
+    else:
+        qlike = f"%{q}%"
+        # COUNT(*) OVER() returns the match total with the page rows, so one scan serves both
+        sql = f"""SELECT {_STUDENT_COLS}, COUNT(*) OVER() FROM students s
+                 WHERE roll_no LIKE %s OR first_name LIKE %s OR last_name LIKE %s OR phone LIKE %s OR email LIKE %s
+                 ORDER BY s.created_at DESC
+                 LIMIT %s OFFSET %s"""
+    params = (qlike,)*len(_SEARCH_COLUMNS)
+    results = _fetchall(sql, params + (page_size, offset), cur, pymysql.cursors.Cursor)
+    if not results and offset:
+        # past the last page (e.g. its only row was deleted): the window total
+        # needs at least one row, so read it from the first match
+        first = _fetchall(sql, params + (1, 0), cur, pymysql.cursors.Cursor)
+        return [], first[0][-1] if first else 0
+    # last column is the window COUNT(*) total
+    total = results[0][-1] if results else 0
+    return [r[:-1] for r in results], total
 
 # Courses
+# list_courses() result, cleared by any course mutation. _courses_gen counts
+# invalidations: a fill that overlapped one is not stored, since its rows may be stale.
+_courses_cache = None
+_course_options_cache = None
+_courses_gen = 0
+_courses_lock = threading.Lock()
+
+def _invalidate_courses():
+    global _courses_cache, _course_options_cache, _courses_gen
+    with _courses_lock:
+        _courses_cache = None
+        _course_options_cache = None
+        _courses_gen += 1
+
 def create_course(data):
     sql = """INSERT INTO courses (code, name, credits, semester, department, description)
              VALUES (%s,%s,%s,%s,%s,%s)"""
@@ -117,9 +186,11 @@ def create_course(data):
             cur.execute(sql, (
                 data['code'], data['name'], data.get('credits',0), data.get('semester'), data.get('department'), data.get('description')
             ))
-            return cur.lastrowid
+            new_id = cur.lastrowid
     finally:
-        conn.close()
+        release(conn)
+    _invalidate_courses()
+    return new_id
 
 def update_course(course_id, data):
     sql = """UPDATE courses SET code=%s, name=%s, credits=%s, semester=%s, department=%s, description=%s WHERE course_id=%s"""
@@ -129,38 +200,94 @@ def update_course(course_id, data):
             cur.execute(sql, (
                 data['code'], data['name'], data.get('credits',0), data.get('semester'), data.get('department'), data.get('description'), course_id
             ))
-            return cur.rowcount
+            count = cur.rowcount
     finally:
-        conn.close()
+        release(conn)
+    _invalidate_courses()
+    return count
 
 def delete_course(course_id):
     conn = get_db_connection()
     try:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM courses WHERE course_id=%s", (course_id,))
-            return cur.rowcount
+            count = cur.rowcount
     finally:
-        conn.close()
+        release(conn)
+    _invalidate_courses()
+    _invalidate_enrollments(course_id)
+    _invalidate_assessments(course_id)
+    return count
+
+def list_courses(cur=None):
+    global _courses_cache
+    with _courses_lock:
+        if _courses_cache is not None:
+            return _courses_cache
+        gen = _courses_gen
+    rows = _fetchall("SELECT course_id, code, name, credits, semester, department FROM courses ORDER BY name", cur=cur)
+    with _courses_lock:
+        if gen == _courses_gen:
+            _courses_cache = rows
+    return rows
+
+def course_options():
+    """Return the cached {"code - name": course_id} mapping used by the course comboboxes."""
+    global _course_options_cache
+    with _courses_lock:
+        opts = _course_options_cache
+        gen = _courses_gen
+    if opts is None:
+        opts = {f"{c['code']} - {c['name']}": c['course_id'] for c in list_courses()}
+        with _courses_lock:
+            if gen == _courses_gen:
+                _course_options_cache = opts
+    return opts
 
-def list_courses():
+# Enrollments
+# Per-course results of list_enrollments_for_course / list_assessments; entries
+# are dropped by the writes that affect them. Fills run on worker threads, so
+# each cache has a generation bumped on invalidation, and a fill that overlapped
+# an invalidation is returned but not stored.
+_enroll_cache = {}
+_assess_cache = {}
+_enroll_gen = 0
+_assess_gen = 0
+_cache_lock = threading.Lock()
+
+def _invalidate_enrollments(course_id=None):
+    global _enroll_gen
+    with _cache_lock:
+        _enroll_gen += 1
+        if course_id is None:
+            _enroll_cache.clear()
+        else:
+            _enroll_cache.pop(course_id, None)
+
+def _invalidate_assessments(course_id):
+    global _assess_gen
+    with _cache_lock:
+        _assess_gen += 1
+        _assess_cache.pop(course_id, None)
+
+def bulk_enroll(course_id, student_ids):
+    """Enroll many students in one multi-row INSERT; existing enrollments are skipped.
+       Returns the number of new enrollments.
+    """
+    params = [(sid, course_id) for sid in student_ids]
+    if not params:
+        return 0
     conn = get_db_connection()
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT * FROM courses ORDER BY name")
-            return cur.fetchall()
+            return cur.executemany("INSERT IGNORE INTO enrollments (student_id, course_id) VALUES (%s,%s)", params)
     finally:
-        conn.close()
+        release(conn)
+        _invalidate_enrollments(course_id)
 
-# Enrollments
 def enroll_student(student_id, course_id):
-    sql = "INSERT INTO enrollments (student_id, course_id) VALUES (%s,%s)"
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql, (student_id, course_id))
-            return cur.lastrowid
-    finally:
-        conn.close()
+    """Returns 1 if enrolled, 0 if the student was already enrolled."""
+    return bulk_enroll(course_id, [student_id])
 
 def unenroll_student(student_id, course_id):
     conn = get_db_connection()
@@ -169,32 +296,73 @@ def unenroll_student(student_id, course_id):
             cur.execute("DELETE FROM enrollments WHERE student_id=%s AND course_id=%s", (student_id, course_id))
             return cur.rowcount
     finally:
-        conn.close()
+        release(conn)
+        _invalidate_enrollments(course_id)
 
 def list_enrollments_for_course(course_id):
-    sql = "SELECT e.*, s.roll_no, s.first_name, s.last_name FROM enrollments e JOIN students s ON s.student_id=e.student_id WHERE e.course_id=%s"
+    with _cache_lock:
+        rows = _enroll_cache.get(course_id)
+        gen = _enroll_gen
+    if rows is None:
+        sql = "SELECT e.id, e.student_id, s.roll_no, s.first_name, s.last_name, e.enrolled_on FROM enrollments e JOIN students s ON s.student_id=e.student_id WHERE e.course_id=%s"
+        rows = _fetchall(sql, (course_id,))
+        with _cache_lock:
+            if gen == _enroll_gen:
+                _enroll_cache[course_id] = rows
+    return rows
+
+# Attendance
+def mark_attendance(student_id, course_id, date_str, status, remarks=''):
+    sql = """INSERT INTO attendance (student_id, course_id, `date`, status, remarks)
+             VALUES (%s,%s,%s,%s,%s) AS new
+             ON DUPLICATE KEY UPDATE status=new.status, remarks=new.remarks"""
     conn = get_db_connection()
     try:
         with conn.cursor() as cur:
-            cur.execute(sql, (course_id,))
-            return cur.fetchall()
+            cur.execute(sql, (student_id, course_id, date_str, status, remarks))
+            return cur.lastrowid
     finally:
-        conn.close()
+        release(conn)
 
-# Attendance
-def mark_attendance(student_id, course_id, date_str, status, remarks=''):
+def bulk_mark_attendance(course_id, date_str, records):
+    """Upsert attendance for many students in one statement.
+       records: iterable of (student_id, status, remarks) tuples.
+       PyMySQL's executemany rewrites this into multi-row INSERTs, split to stay under max_allowed_packet.
+       (Keeps VALUES() rather than the row alias form: the rewrite only recognizes a bare ON DUPLICATE suffix.)
+    """
     sql = """INSERT INTO attendance (student_id, course_id, `date`, status, remarks)
              VALUES (%s,%s,%s,%s,%s)
-             ON DUPLICATE KEY UPDATE status=%s, remarks=%s"""
+             ON DUPLICATE KEY UPDATE status=VALUES(status), remarks=VALUES(remarks)"""
+    params = [(sid, course_id, date_str, status, remarks) for sid, status, remarks in records]
+    if not params:
+        return 0
+    conn = get_db_connection()
+    try:
+        # one explicit transaction so all batches share a single commit/log flush
+        conn.begin()
+        try:
+            with conn.cursor() as cur:
+                count = cur.executemany(sql, params)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return count
+    finally:
+        release(conn)
+
+def get_attendance_map(course_id, date_str):
+    """Return {student_id: status} for every attendance row of a course on a date."""
     conn = get_db_connection()
     try:
         with conn.cursor() as cur:
-            cur.execute(sql, (student_id, course_id, date_str, status, remarks, status, remarks))
-            return cur.lastrowid
+            cur.execute("SELECT student_id, status FROM attendance WHERE course_id=%s AND date=%s", (course_id, date_str))
+            return {r['student_id']: r['status'] for r in cur.fetchall()}
     finally:
-        conn.close()
+        release(conn)
 
 def get_attendance(course_id, date_from=None, date_to=None):
+    """Return an iterator over the course's attendance rows (streamed)."""
     sql = "SELECT a.*, s.roll_no, s.first_name, s.last_name FROM attendance a JOIN students s ON s.student_id=a.student_id WHERE a.course_id=%s"
     params = [course_id]
     if date_from:
@@ -204,51 +372,130 @@ def get_attendance(course_id, date_from=None, date_to=None):
         sql += " AND a.date <= %s"
         params.append(date_to)
     sql += " ORDER BY a.date DESC"
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql, tuple(params))
-            return cur.fetchall()
-    finally:
-        conn.close()
+    return _stream(sql, tuple(params))
 
 # Assessments & Grades
-def list_assessments(course_id):
+def list_assessments(course_id, cur=None):
+    with _cache_lock:
+        rows = _assess_cache.get(course_id)
+        gen = _assess_gen
+    if rows is None:
+        rows = _fetchall("SELECT assessment_id, name, max_score FROM assessments WHERE course_id=%s ORDER BY name", (course_id,), cur)
+        with _cache_lock:
+            if gen == _assess_gen:
+                _assess_cache[course_id] = rows
+    return rows
+
+def _exec_add_grade(cur, student_id, course_id, assessment_id, score):
+    sql = "INSERT INTO grades (student_id, course_id, assessment_id, score) VALUES (%s,%s,%s,%s) AS new ON DUPLICATE KEY UPDATE score=new.score"
+    cur.execute(sql, (student_id, course_id, assessment_id, score))
+    return cur.lastrowid
+
+def add_grade(student_id, course_id, assessment_id, score, cur=None):
+    """Upsert one grade in a single round trip.
+       Pass cur (e.g. GradesTab's long-lived cursor) to reuse its connection across calls.
+    """
+    if cur is not None:
+        return _exec_add_grade(cur, student_id, course_id, assessment_id, score)
     conn = get_db_connection()
     try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM assessments WHERE course_id=%s ORDER BY name", (course_id,))
-            return cur.fetchall()
+        with conn.cursor() as c:
+            return _exec_add_grade(c, student_id, course_id, assessment_id, score)
     finally:
-        conn.close()
+        release(conn)
 
-def add_grade(student_id, course_id, assessment_id, score):
-    sql = "INSERT INTO grades (student_id, course_id, assessment_id, score) VALUES (%s,%s,%s,%s) ON DUPLICATE KEY UPDATE score=%s"
+def add_grades_bulk(rows):
+    """Upsert many grades in one transaction.
+       rows: iterable of (student_id, course_id, assessment_id, score) tuples;
+       executemany rewrites the statement into multi-row INSERTs.
+    """
+    sql = "INSERT INTO grades (student_id, course_id, assessment_id, score) VALUES (%s,%s,%s,%s) ON DUPLICATE KEY UPDATE score=VALUES(score)"
+    params = list(rows)
+    if not params:
+        return 0
     conn = get_db_connection()
     try:
-        with conn.cursor() as cur:
-            cur.execute(sql, (student_id, course_id, assessment_id, score, score))
-            return cur.lastrowid
+        conn.begin()
+        try:
+            with conn.cursor() as cur:
+                count = cur.executemany(sql, params)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return count
     finally:
-        conn.close()
+        release(conn)
+
+def get_grades(course_id, offset=0, limit=500, cur=None):
+    """Return one page of the course's grade rows, ordered by roll no."""
+    sql = "SELECT g.student_id, g.score, s.roll_no, CONCAT_WS(' ', s.first_name, s.last_name) AS full_name, a.name as assessment_name, a.max_score FROM grades g JOIN students s ON s.student_id=g.student_id JOIN assessments a ON a.assessment_id=g.assessment_id WHERE g.course_id=%s ORDER BY s.roll_no, g.student_id, g.assessment_id LIMIT %s OFFSET %s"
+    return _fetchall(sql, (course_id, limit, offset), cur)
+
+# Background DB work: loaders run queries here so the Tk mainloop never blocks
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Finished futures waiting for the Tk thread. Workers only put here; poll_done
+# drains it from the mainloop, so no worker ever calls into Tk (which fails
+# before mainloop() is running and after the window is gone).
+_DONE = queue.Queue()
+DONE_POLL_MS = 20
+
+def after_done(fut, callback, *args):
+    """Call callback(fut, *args) on the Tk thread once fut finishes."""
+    fut.add_done_callback(lambda f: _DONE.put((callback, f, args)))
+
+def poll_done(root):
+    """Tk thread: run the callbacks of finished futures, then poll again."""
+    root.after(DONE_POLL_MS, poll_done, root)
+    while True:
+        try:
+            callback, fut, args = _DONE.get_nowait()
+        except queue.Empty:
+            return
+        callback(fut, *args)
 
-def get_grades(course_id):
-    sql = "SELECT g.*, s.roll_no, s.first_name, s.last_name, a.name as assessment_name, a.max_score FROM grades g JOIN students s ON s.student_id=g.student_id JOIN assessments a ON a.assessment_id=g.assessment_id WHERE g.course_id=%s ORDER BY s.roll_no"
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql, (course_id,))
-            return cur.fetchall()
-    finally:
-        conn.close()
+def submit_db(on_done, fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) on DB_EXECUTOR and pass its result to on_done on the Tk thread."""
+    def deliver(fut):
+        try:
+            result = fut.result()
+        except Exception as e:
+            messagebox.showerror('Error', str(e))
+            return
+        on_done(result)
+    after_done(DB_EXECUTOR.submit(fn, *args, **kwargs), deliver)
+
+def _full_name(r):
+    return f"{r['first_name']} {r.get('last_name') or ''}"
 
 # Reports: CSV export helpers
-def export_csv(rows, headers, filepath):
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+# exports run here so a long query + write never blocks the Tk mainloop
+# 2 workers keeps the pool budget (db_pool.py): 3 tab cursors + 4 loaders + 2 exports = 9 of 10;
+# Export All queues its four jobs on these same workers
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=2)
+
+def export_csv(cursor, headers, filepath, chunk=5000):
+    """Write the executed cursor's rows to filepath, chunk rows at a time.
+       Rows are tuples whose column order matches headers.
+       A path ending in .gz is written gzip-compressed (level 1: fast, still ~5x smaller).
+       Returns the row count.
+    """
+    count = 0
+    if filepath.endswith('.gz'):
+        f = gzip.open(filepath, 'wt', compresslevel=1, newline='', encoding='utf-8')
+    else:
+        f = open(filepath, 'w', newline='', encoding='utf-8', buffering=1<<20)
+    with f:
         writer = csv.writer(f)
         writer.writerow(headers)
-        for r in rows:
-            writer.writerow([r.get(h, '') for h in headers])
+        while True:
+            batch = cursor.fetchmany(chunk)
+            if not batch:
+                break
+            writer.writerows(batch)
+            count += len(batch)
+    return count
 
 # GUI
 class App(tk.Tk):
@@ -264,6 +511,8 @@ class App(tk.Tk):
         style.configure('TButton', padding=6)
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill='both', expand=True)
+        # course combobox mapping shared by the Enroll/Attendance/Grades tabs
+        self.course_map = course_options()
         self.students_tab = StudentsTab(self.notebook)
         self.courses_tab = CoursesTab(self.notebook)
         self.enroll_tab = EnrollTab(self.notebook)
@@ -278,8 +527,52 @@ class App(tk.Tk):
         self.notebook.add(self.grade_tab, text='Grades')
         self.notebook.add(self.report_tab, text='Reports')
         self.notebook.add(self.settings_tab, text='Settings')
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        # loads submitted above are delivered once the mainloop picks this up
+        poll_done(self)
+
+    def invalidate_course_map(self):
+        """Rebuild course_map after a course mutation and refresh the dependent tabs."""
+        self.course_map = course_options()
+        for tab in (self.enroll_tab, self.att_tab, self.grade_tab):
+            tab.load_course_options()
+
+    def on_close(self):
+        for tab in (self.students_tab, self.courses_tab, self.grade_tab):
+            try:
+                tab.close_db()
+            except Exception:
+                pass
+        DB_EXECUTOR.shutdown(wait=False)
+        _EXPORT_POOL.shutdown(wait=False)
+        self.destroy()
+
+class CursorTab(ttk.Frame):
+    """Tab that keeps one pooled connection and cursor open for its read queries."""
+    cursorclass = pymysql.cursors.DictCursor
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.conn = get_db_connection()
+        self.cur = self.conn.cursor(self.cursorclass)
+        self.cur_lock = threading.Lock()
+
+    def with_cur(self, fn, *args, **kwargs):
+        """Call fn with this tab's cursor; serialized since loads run on worker threads."""
+        with self.cur_lock:
+            return fn(*args, cur=self.cur, **kwargs)
+
+    def close_db(self):
+        with self.cur_lock:
+            try:
+                self.cur.close()
+            finally:
+                release(self.conn)
+
+class StudentsTab(CursorTab):
+    # search_students renders from plain tuples
+    cursorclass = pymysql.cursors.Cursor
 
-class StudentsTab(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         # Left: form, Right: list
@@ -287,7 +580,7 @@ class StudentsTab(ttk.Frame):
         frm = ttk.Frame(self)
         frm.grid(row=0, column=0, sticky='ns')
         # Form fields
-        self.vars = {k:tk.StringVar() for k in ('student_id','roll_no','first_name','last_name','gender','dob','phone','email','address_line')}
+        self.vars = {k:tk.StringVar() for k in _STUDENT_KEYS}
         lbls = ['Roll No','First Name','Last Name','Gender','DOB (YYYY-MM-DD)','Phone','Email','Address']
         for i, key in enumerate(('roll_no','first_name','last_name','gender','dob','phone','email','address_line')):
             ttk.Label(frm, text=lbls[i]).grid(row=i, column=0, sticky='w', pady=4)
@@ -309,8 +602,10 @@ class StudentsTab(ttk.Frame):
         search_frame.pack(fill='x', pady=4)
         self.search_var = tk.StringVar()
         ttk.Entry(search_frame, textvariable=self.search_var).pack(side='left', fill='x', expand=True, padx=4)
+        self.prefix_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text='Starts with', variable=self.prefix_var).pack(side='left', padx=4)
         ttk.Button(search_frame, text='Search', command=self.load_students).pack(side='left', padx=4)
-        self.tree = ttk.Treeview(right, columns=('student_id','roll_no','first_name','last_name','gender','dob','phone','email','address_line'), show='headings', height=20)
+        self.tree = ttk.Treeview(right, columns=_STUDENT_KEYS, show='headings', height=20)
         for c in self.tree['columns']:
             self.tree.heading(c, text=c.replace('_',' ').title())
             self.tree.column(c, width=100, anchor='center')
@@ -321,6 +616,7 @@ class StudentsTab(ttk.Frame):
         pg.pack(fill='x')
         self.page = 1
         self.total = 0
+        self._last_rows = None
         ttk.Button(pg, text='Prev', command=self.prev_page).pack(side='left')
         ttk.Button(pg, text='Next', command=self.next_page).pack(side='left')
         self.page_lbl = ttk.Label(pg, text='Page 1')
@@ -395,20 +691,28 @@ class StudentsTab(ttk.Frame):
         sel = self.tree.selection()
         if not sel: return
         item = self.tree.item(sel[0])['values']
-        keys = ('student_id','roll_no','first_name','last_name','gender','dob','phone','email','address_line')
-        for i,k in enumerate(keys):
+        for i,k in enumerate(_STUDENT_KEYS):
             self.vars[k].set(item[i])
 
     def load_students(self):
         q = self.search_var.get().strip()
-        rows, total = search_students(q, page=self.page, page_size=25)
+        mode = 'prefix' if self.prefix_var.get() and q else 'contains'
+        submit_db(self._on_students_loaded, self.with_cur, search_students, q, page=self.page, page_size=25, mode=mode)
+
+    def _on_students_loaded(self, result):
+        values, total = result
         self.total = total
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        for r in rows:
-            self.tree.insert('', 'end', values=(r['student_id'], r['roll_no'], r['first_name'], r.get('last_name') or '',
-                                                r.get('gender') or '', r.get('dob') and str(r['dob']) or '',
-                                                r.get('phone') or '', r.get('email') or '', r.get('address_line') or ''))
+        if not values and self.page > 1 and total:
+            # the page emptied under us; show the last one that still has rows
+            self.page = (total - 1) // 25 + 1
+            self.load_students()
+            return
+        # skip the Treeview rebuild when the page is unchanged
+        if values != self._last_rows:
+            self._last_rows = values
+            self.tree.delete(*self.tree.get_children())
+            for v in values:
+                self.tree.insert('', 'end', values=v)
         self.page_lbl.config(text=f'Page {self.page} ({self.total} total)')
 
     def prev_page(self):
@@ -422,7 +726,7 @@ class StudentsTab(ttk.Frame):
             self.page+=1
             self.load_students()
 
-class CoursesTab(ttk.Frame):
+class CoursesTab(CursorTab):
     def __init__(self, parent):
         super().__init__(parent)
         self.columnconfigure(1, weight=1)
@@ -450,6 +754,7 @@ class CoursesTab(ttk.Frame):
             self.tree.column(c, width=120, anchor='center')
         self.tree.pack(fill='both', expand=True)
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self._last_rows = None
         self.load_courses()
 
     def add_course(self):
@@ -462,6 +767,7 @@ class CoursesTab(ttk.Frame):
             messagebox.showinfo('Success','Course added')
             self.clear_form()
             self.load_courses()
+            self.winfo_toplevel().invalidate_course_map()
         except pymysql.err.IntegrityError:
             messagebox.showerror('Error','Duplicate course code')
         except Exception as e:
@@ -478,6 +784,7 @@ class CoursesTab(ttk.Frame):
             messagebox.showinfo('Success','Course updated')
             self.clear_form()
             self.load_courses()
+            self.winfo_toplevel().invalidate_course_map()
         except pymysql.err.IntegrityError:
             messagebox.showerror('Error','Duplicate course code')
         except Exception as e:
@@ -495,6 +802,7 @@ class CoursesTab(ttk.Frame):
             messagebox.showinfo('Deleted','Course deleted')
             self.clear_form()
             self.load_courses()
+            self.winfo_toplevel().invalidate_course_map()
         except Exception as e:
             messagebox.showerror('Error',str(e))
 
@@ -512,11 +820,16 @@ class CoursesTab(ttk.Frame):
             self.vars[k].set(item[i])
 
     def load_courses(self):
-        rows = list_courses()
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        for r in rows:
-            self.tree.insert('', 'end', values=(r['course_id'], r['code'], r['name'], r.get('credits') or 0, r.get('semester') or '', r.get('department') or ''))
+        submit_db(self._on_courses_loaded, self.with_cur, list_courses)
+
+    def _on_courses_loaded(self, rows):
+        values = [(r['course_id'], r['code'], r['name'], r.get('credits') or 0, r.get('semester') or '', r.get('department') or '') for r in rows]
+        if values == self._last_rows:
+            return
+        self._last_rows = values
+        self.tree.delete(*self.tree.get_children())
+        for v in values:
+            self.tree.insert('', 'end', values=v)
 
 class EnrollTab(ttk.Frame):
     def __init__(self, parent):
@@ -543,22 +856,24 @@ class EnrollTab(ttk.Frame):
             self.tree.heading(c, text=c.replace('_',' ').title())
             self.tree.column(c, width=120, anchor='center')
         self.tree.pack(fill='both', expand=True)
+        self._last_rows = None
         self.load_course_options()
+        self.load_student_options()
 
     def load_course_options(self):
-        courses = list_courses()
-        self.course_map = {f"{c['code']} - {c['name']}": c['course_id'] for c in courses}
+        self.course_map = self.winfo_toplevel().course_map
         self.course_cb['values'] = list(self.course_map.keys())
-        # students for combobox
+
+    def load_student_options(self):
         conn = get_db_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("SELECT student_id, roll_no, first_name, last_name FROM students ORDER BY roll_no")
                 rows = cur.fetchall()
-                self.student_map = {f"{r['roll_no']} - {r['first_name']} {r.get('last_name') or ''}": r['student_id'] for r in rows}
+                self.student_map = {f"{r['roll_no']} - {_full_name(r)}": r['student_id'] for r in rows}
                 self.student_cb['values'] = list(self.student_map.keys())
         finally:
-            conn.close()
+            release(conn)
 
     def load_students(self):
         key = self.course_var.get()
@@ -566,11 +881,16 @@ class EnrollTab(ttk.Frame):
             messagebox.showwarning('Select','Select a course first')
             return
         course_id = self.course_map[key]
-        rows = list_enrollments_for_course(course_id)
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        for r in rows:
-            self.tree.insert('', 'end', values=(r['id'], r['student_id'], r['roll_no'], f"{r['first_name']} {r.get('last_name') or ''}", str(r.get('enrolled_on'))))
+        submit_db(self._on_enrollments_loaded, list_enrollments_for_course, course_id)
+
+    def _on_enrollments_loaded(self, rows):
+        values = [(r['id'], r['student_id'], r['roll_no'], _full_name(r), str(r.get('enrolled_on'))) for r in rows]
+        if values == self._last_rows:
+            return
+        self._last_rows = values
+        self.tree.delete(*self.tree.get_children())
+        for v in values:
+            self.tree.insert('', 'end', values=v)
 
     def enroll(self):
         skey = self.student_var.get()
@@ -581,11 +901,11 @@ class EnrollTab(ttk.Frame):
         student_id = self.student_map[skey]
         course_id = self.course_map[ckey]
         try:
-            enroll_student(student_id, course_id)
+            if not enroll_student(student_id, course_id):
+                messagebox.showerror('Error','Already enrolled')
+                return
             messagebox.showinfo('Enrolled','Student enrolled')
             self.load_students()
-        except pymysql.err.IntegrityError:
-            messagebox.showerror('Error','Already enrolled')
         except Exception as e:
             messagebox.showerror('Error',str(e))
 
@@ -633,8 +953,7 @@ class AttendanceTab(ttk.Frame):
         self.load_course_options()
 
     def load_course_options(self):
-        courses = list_courses()
-        self.course_map = {f"{c['code']} - {c['name']}": c['course_id'] for c in courses}
+        self.course_map = self.winfo_toplevel().course_map
         self.course_cb['values'] = list(self.course_map.keys())
 
     def load_enrolled(self):
@@ -643,23 +962,17 @@ class AttendanceTab(ttk.Frame):
             messagebox.showwarning('Select','Select a course first')
             return
         course_id = self.course_map[key]
-        rows = list_enrollments_for_course(course_id)
-        for r in self.tree.get_children():
-            self.tree.delete(r)
+        date_str = self.date_var.get().strip()
+        def fetch():
+            return list_enrollments_for_course(course_id), get_attendance_map(course_id, date_str)
+        submit_db(self._on_enrolled_loaded, fetch)
+
+    def _on_enrolled_loaded(self, result):
+        rows, attmap = result
+        self.tree.delete(*self.tree.get_children())
         for r in rows:
-            # Try to fetch existing attendance for date
-            date_str = self.date_var.get().strip()
-            status = ''
-            conn = get_db_connection()
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT status FROM attendance WHERE student_id=%s AND course_id=%s AND date=%s", (r['student_id'], course_id, date_str))
-                    rec = cur.fetchone()
-                    if rec:
-                        status = rec['status']
-            finally:
-                conn.close()
-            self.tree.insert('', 'end', values=(r['student_id'], r['roll_no'], f"{r['first_name']} {r.get('last_name') or ''}", status or 'Absent'))
+            status = attmap.get(r['student_id'], '')
+            self.tree.insert('', 'end', values=(r['student_id'], r['roll_no'], _full_name(r), status or 'Absent'))
 
     def toggle_status(self, ev):
         sel = self.tree.selection()
@@ -685,14 +998,19 @@ class AttendanceTab(ttk.Frame):
         date_str = self.date_var.get().strip()
         rows = list_enrollments_for_course(course_id)
         try:
-            for r in rows:
-                mark_attendance(r['student_id'], course_id, date_str, 'Present')
+            bulk_mark_attendance(course_id, date_str, [(r['student_id'], 'Present', '') for r in rows])
             messagebox.showinfo('Done','Marked all present')
             self.load_enrolled()
         except Exception as e:
             messagebox.showerror('Error',str(e))
 
-class GradesTab(ttk.Frame):
+class GradesTab(CursorTab):
+    COLUMNS = ('student_id','roll_no','name','score','max_score','assessment')
+    HEADINGS = [(c, c.replace('_',' ').title()) for c in COLUMNS]
+    PAGE_SIZE = 500
+    DRAIN_BATCH = 200   # Treeview inserts per Tk tick
+    DRAIN_MS = 20
+
     def __init__(self, parent):
         super().__init__(parent)
         left = ttk.Frame(self)
@@ -711,20 +1029,30 @@ class GradesTab(ttk.Frame):
         self.score_var = tk.StringVar()
         ttk.Entry(left, textvariable=self.score_var).grid(row=4, column=1, pady=4)
         ttk.Button(left, text='Add/Update Grade', command=self.add_grade).grid(row=5, column=0, columnspan=2, pady=6)
+        ttk.Button(left, text='Apply Score to Selected', command=self.apply_score_to_selected).grid(row=6, column=0, columnspan=2, pady=6)
+        ttk.Button(left, text='Import Grades CSV', command=self.import_grades).grid(row=7, column=0, columnspan=2, pady=6)
 
         right = ttk.Frame(self)
         right.grid(row=0, column=1, sticky='nsew')
         right.columnconfigure(0, weight=1)
-        self.tree = ttk.Treeview(right, columns=('student_id','roll_no','name','score','max_score','assessment'), show='headings', height=20)
-        for c in self.tree['columns']:
-            self.tree.heading(c, text=c.replace('_',' ').title())
+        self.tree = ttk.Treeview(right, columns=self.COLUMNS, displaycolumns=self.COLUMNS, show='headings', height=20)
+        for c, text in self.HEADINGS:
+            self.tree.heading(c, text=text)
             self.tree.column(c, width=120, anchor='center')
+        self.vsb = ttk.Scrollbar(right, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.vsb.pack(side='right', fill='y')
         self.tree.pack(fill='both', expand=True)
+        # current load: its id (stale pages are dropped), course, next offset, and whether more pages remain
+        self._load_id = 0
+        self._grade_course = None
+        self._offset = 0
+        self._more = False
+        self._fetching = False
         self.load_course_options()
 
     def load_course_options(self):
-        courses = list_courses()
-        self.course_map = {f"{c['code']} - {c['name']}": c['course_id'] for c in courses}
+        self.course_map = self.winfo_toplevel().course_map
         self.course_cb['values'] = list(self.course_map.keys())
 
     def load_assessments(self):
@@ -733,7 +1061,9 @@ class GradesTab(ttk.Frame):
             messagebox.showwarning('Select','Select course')
             return
         course_id = self.course_map[key]
-        assessments = list_assessments(course_id)
+        submit_db(self._on_assessments_loaded, self.with_cur, list_assessments, course_id)
+
+    def _on_assessments_loaded(self, assessments):
         self.assess_map = {f"{a['name']} (Max {a['max_score']})": a['assessment_id'] for a in assessments}
         self.assess_cb['values'] = list(self.assess_map.keys())
 
@@ -743,11 +1073,46 @@ class GradesTab(ttk.Frame):
             messagebox.showwarning('Select','Select course')
             return
         course_id = self.course_map[key]
-        rows = get_grades(course_id)
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        for r in rows:
-            self.tree.insert('', 'end', values=(r['student_id'], r['roll_no'], f"{r['first_name']} {r.get('last_name') or ''}", float(r['score']), r.get('max_score'), r.get('assessment_name')))
+        self._load_id += 1
+        self._grade_course = course_id
+        self._offset = 0
+        self._more = True
+        self.tree.delete(*self.tree.get_children())
+        self._fetch_page()
+
+    def _fetch_page(self):
+        # pages come from the DB with LIMIT/OFFSET; nothing stays open between them
+        self._fetching = True
+        load_id = self._load_id
+        submit_db(lambda rows: self._on_grades_page(load_id, rows),
+                  self.with_cur, get_grades, self._grade_course, self._offset, self.PAGE_SIZE)
+
+    def _on_grades_page(self, load_id, rows):
+        if load_id != self._load_id:
+            return   # superseded by a newer load
+        self._offset += len(rows)
+        self._more = len(rows) == self.PAGE_SIZE
+        values = [(r['student_id'], r['roll_no'], r['full_name'], float(r['score']), r.get('max_score'), r.get('assessment_name')) for r in rows]
+        self._drain_grades(load_id, values, 0)
+
+    def _drain_grades(self, load_id, values, start):
+        # the page is already read to the end; insert it DRAIN_BATCH rows per tick
+        # so the UI keeps handling events
+        if load_id != self._load_id:
+            return
+        end = start + self.DRAIN_BATCH
+        for v in values[start:end]:
+            self.tree.insert('', 'end', values=v)
+        if end < len(values):
+            self.after(self.DRAIN_MS, self._drain_grades, load_id, values, end)
+        else:
+            self._fetching = False
+
+    def _on_tree_scroll(self, first, last):
+        self.vsb.set(first, last)
+        # scrolled to the bottom: fetch the next page
+        if float(last) >= 1.0 and self._more and not self._fetching:
+            self._fetch_page()
 
     def add_grade(self):
         akey = self.assess_var.get()
@@ -766,84 +1131,181 @@ class GradesTab(ttk.Frame):
             return
         assessment_id = self.assess_map[akey]
         course_id = self.course_map[self.course_var.get()]
+        # on a worker: the tab cursor's lock may be held by a running load
+        submit_db(self._on_grade_saved, self.with_cur, add_grade, skey, course_id, assessment_id, score)
+
+    def _on_grade_saved(self, _):
+        messagebox.showinfo('Saved','Grade saved')
+        self.load_students()
+
+    def apply_score_to_selected(self):
+        akey = self.assess_var.get()
+        sel = self.tree.selection()
+        if not akey or not sel:
+            messagebox.showwarning('Select','Select assessment and one or more student rows first')
+            return
+        try:
+            score = float(self.score_var.get())
+        except ValueError:
+            messagebox.showwarning('Validation','Enter numeric score')
+            return
+        assessment_id = self.assess_map[akey]
+        course_id = self.course_map[self.course_var.get()]
+        student_ids = {self.tree.item(i)['values'][0] for i in sel}
+        try:
+            add_grades_bulk((sid, course_id, assessment_id, score) for sid in student_ids)
+            messagebox.showinfo('Saved', f'{len(student_ids)} grades saved')
+            self.load_students()
+        except Exception as e:
+            messagebox.showerror('Error',str(e))
+
+    def import_grades(self):
+        """Import a CSV with roll_no and score columns into the selected assessment."""
+        akey = self.assess_var.get()
+        ckey = self.course_var.get()
+        if not akey or not ckey:
+            messagebox.showwarning('Select','Select course and assessment first')
+            return
+        path = filedialog.askopenfilename(filetypes=[('CSV','*.csv')])
+        if not path: return
+        assessment_id = self.assess_map[akey]
+        course_id = self.course_map[ckey]
         try:
-            add_grade(skey, course_id, assessment_id, score)
-            messagebox.showinfo('Saved','Grade saved')
+            by_roll = {r['roll_no']: r['student_id'] for r in list_enrollments_for_course(course_id)}
+            rows, skipped = [], 0
+            with open(path, newline='', encoding='utf-8-sig') as f:  # -sig strips Excel's BOM
+                for r in csv.DictReader(f):
+                    sid = by_roll.get((r.get('roll_no') or '').strip())
+                    try:
+                        score = float(r.get('score') or '')
+                    except ValueError:
+                        sid = None
+                    if sid is None:
+                        skipped += 1
+                        continue
+                    rows.append((sid, course_id, assessment_id, score))
+            add_grades_bulk(rows)
+            msg = f'{len(rows)} grades imported'
+            if skipped:
+                msg += f' ({skipped} rows skipped: unknown roll no or invalid score)'
+            messagebox.showinfo('Imported', msg)
             self.load_students()
         except Exception as e:
             messagebox.showerror('Error',str(e))
 
 class ReportsTab(ttk.Frame):
+    # name -> (query, CSV headers); headers follow the query's column order.
+    # courses.code and attendance (date DESC) are indexed so the optimizer can
+    # read rows already sorted instead of filesorting; the join order is left to it.
+    EXPORTS = {
+        'students': ("SELECT roll_no, first_name, last_name, gender, dob, phone, email, address_line FROM students ORDER BY roll_no",
+                     ['roll_no','first_name','last_name','gender','dob','phone','email','address_line']),
+        'enrollments': ("SELECT c.code as course_code, c.name as course_name, s.roll_no, s.first_name, s.last_name FROM courses c JOIN enrollments e ON e.course_id=c.course_id JOIN students s ON s.student_id=e.student_id ORDER BY c.code",
+                        ['course_code','course_name','roll_no','first_name','last_name']),
+        'attendance': ("SELECT c.code as course_code, a.date, s.roll_no, s.first_name, s.last_name, a.status FROM attendance a JOIN students s ON s.student_id=a.student_id JOIN courses c ON c.course_id=a.course_id ORDER BY a.date DESC",
+                       ['course_code','date','roll_no','first_name','last_name','status']),
+        'grades': ("SELECT c.code as course_code, a.name as assessment, s.roll_no, s.first_name, s.last_name, g.score FROM courses c JOIN grades g ON g.course_id=c.course_id JOIN students s ON s.student_id=g.student_id JOIN assessments a ON a.assessment_id=g.assessment_id ORDER BY c.code",
+                   ['course_code','assessment','roll_no','first_name','last_name','score']),
+    }
+
     def __init__(self, parent):
         super().__init__(parent)
-        ttk.Button(self, text='Export Students CSV', command=self.export_students).pack(pady=6)
-        ttk.Button(self, text='Export Enrollments CSV', command=self.export_enrollments).pack(pady=6)
-        ttk.Button(self, text='Export Attendance CSV', command=self.export_attendance).pack(pady=6)
-        ttk.Button(self, text='Export Grades CSV', command=self.export_grades).pack(pady=6)
-
-    def export_students(self):
+        self.buttons = [
+            ttk.Button(self, text='Export Students CSV', command=self.export_students),
+            ttk.Button(self, text='Export Enrollments CSV', command=self.export_enrollments),
+            ttk.Button(self, text='Export Attendance CSV', command=self.export_attendance),
+            ttk.Button(self, text='Export Grades CSV', command=self.export_grades),
+            ttk.Button(self, text='Export All CSVs', command=self.export_all),
+        ]
+        for b in self.buttons:
+            b.pack(pady=6)
+        self.progress = ttk.Progressbar(self, mode='indeterminate', length=200)
+        self.progress.pack(pady=6)
+
+    def _do_export(self, name, path):
+        # worker thread: rows stream from an unbuffered cursor straight into the file
+        sql, headers = self.EXPORTS[name]
         conn = get_db_connection()
         try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT roll_no, first_name, last_name, gender, dob, phone, email, address_line FROM students ORDER BY roll_no")
-                rows = cur.fetchall()
+            # tuple rows: csv.writer only needs positional access
+            with conn.cursor(pymysql.cursors.SSCursor) as cur:
+                cur.execute(sql)
+                count = export_csv(cur, headers, path)
         finally:
-            conn.close()
-        if not rows:
-            messagebox.showinfo('No Data','No students to export')
-            return
-        path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV','*.csv')])
+            release(conn)
+        if not count:
+            os.remove(path)
+        return count
+
+    def _set_busy(self, busy):
+        for b in self.buttons:
+            b.state(['disabled'] if busy else ['!disabled'])
+        if busy:
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+
+    def _export(self, name):
+        # resolve the path before any connection is leased: the dialog can stay open
+        # indefinitely and a cancel should cost no DB work
+        path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV','*.csv'), ('Gzipped CSV','*.csv.gz')])
         if not path: return
-        export_csv(rows, ['roll_no','first_name','last_name','gender','dob','phone','email','address_line'], path)
-        messagebox.showinfo('Saved', f'Exported to {path}')
+        self._set_busy(True)
+        fut = _EXPORT_POOL.submit(self._do_export, name, path)
+        after_done(fut, self._report_done, path, name)
 
-    def export_enrollments(self):
-        conn = get_db_connection()
+    def _report_done(self, fut, path, name):
+        self._set_busy(False)
         try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT c.code as course_code, c.name as course_name, s.roll_no, s.first_name, s.last_name FROM enrollments e JOIN students s ON s.student_id=e.student_id JOIN courses c ON c.course_id=e.course_id ORDER BY c.code")
-                rows = cur.fetchall()
-        finally:
-            conn.close()
-        if not rows:
-            messagebox.showinfo('No Data','No enrollments to export')
+            count = fut.result()
+        except Exception as e:
+            messagebox.showerror('Error', str(e))
+            return
+        if not count:
+            messagebox.showinfo('No Data', f'No {name} to export')
             return
-        path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV','*.csv')])
-        if not path: return
-        export_csv(rows, ['course_code','course_name','roll_no','first_name','last_name'], path)
         messagebox.showinfo('Saved', f'Exported to {path}')
 
-    def export_attendance(self):
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT c.code as course_code, a.date, s.roll_no, s.first_name, s.last_name, a.status FROM attendance a JOIN students s ON s.student_id=a.student_id JOIN courses c ON c.course_id=a.course_id ORDER BY a.date DESC")
-                rows = cur.fetchall()
-        finally:
-            conn.close()
-        if not rows:
-            messagebox.showinfo('No Data','No attendance to export')
+    def export_all(self):
+        """Write all four CSVs into one folder, two exports at a time."""
+        folder = filedialog.askdirectory()
+        if not folder: return
+        paths = {name: os.path.join(folder, f'{name}.csv') for name in self.EXPORTS}
+        existing = [os.path.basename(p) for p in paths.values() if os.path.exists(p)]
+        if existing and not messagebox.askyesno('Overwrite', 'Replace existing files?\n' + '\n'.join(existing)):
             return
-        path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV','*.csv')])
-        if not path: return
-        export_csv(rows, ['course_code','date','roll_no','first_name','last_name','status'], path)
-        messagebox.showinfo('Saved', f'Exported to {path}')
+        self._set_busy(True)
+        futs = {name: _EXPORT_POOL.submit(self._do_export, name, path) for name, path in paths.items()}
+        pending = set(futs)
+        def part_done(fut, name):
+            pending.discard(name)
+            if not pending:
+                self._report_all_done(futs, folder)
+        for name, fut in futs.items():
+            after_done(fut, part_done, name)
+
+    def _report_all_done(self, futs, folder):
+        self._set_busy(False)
+        lines = []
+        for name, fut in futs.items():
+            try:
+                count = fut.result()
+                lines.append(f'{name}: {count} rows' if count else f'{name}: no data')
+            except Exception as e:
+                lines.append(f'{name}: error - {e}')
+        messagebox.showinfo('Export All', f'Exported to {folder}\n' + '\n'.join(lines))
+
+    def export_students(self):
+        self._export('students')
+
+    def export_enrollments(self):
+        self._export('enrollments')
+
+    def export_attendance(self):
+        self._export('attendance')
 
     def export_grades(self):
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT c.code as course_code, a.name as assessment, s.roll_no, s.first_name, s.last_name, g.score FROM grades g JOIN students s ON s.student_id=g.student_id JOIN assessments a ON a.assessment_id=g.assessment_id JOIN courses c ON c.course_id=g.course_id ORDER BY c.code")
-                rows = cur.fetchall()
-        finally:
-            conn.close()
-        if not rows:
-            messagebox.showinfo('No Data','No grades to export')
-            return
-        path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV','*.csv')])
-        if not path: return
-        export_csv(rows, ['course_code','assessment','roll_no','first_name','last_name','score'], path)
-        messagebox.showinfo('Saved', f'Exported to {path}')
+        self._export('grades')
 
 class SettingsTab(ttk.Frame):
     def __init__(self, parent):
@@ -859,7 +1321,7 @@ def main():
     # basic DB connectivity check
     try:
         conn = get_db_connection()
-        conn.close()
+        release(conn)
     except Exception as e:
         messagebox.showerror('DB Error', f'Unable to connect to database. Run db_init.py or check config.py.\\nError: {e}')
         return
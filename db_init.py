@@ -1,23 +1,64 @@
 import pymysql, os, sys
+import pymysql.constants.CLIENT
 import config
 
 SQL_FILE = os.path.join(os.path.dirname(__file__), 'db', 'init.sql')
 
+# Secondary indexes, created here only (init.sql defines tables and their keys) so a
+# fresh database and an existing one end up with the same set.
+# students: back search_students (roll_no and email are covered by their UNIQUE keys).
+# enrollments/attendance/grades: back the report export joins. Lookups by student_id
+# use the leading column of the unique keys the upserts rely on (enrollments
+# (student_id, course_id), attendance (student_id, course_id, date), grades
+# (student_id, course_id, assessment_id)), so no separate student indexes.
+# courses.code is UNIQUE, so both exports ordering by c.code get an index scan.
+INDEXES = [
+    ('students', 'idx_students_name', '(first_name, last_name)'),
+    ('students', 'idx_students_last_name', '(last_name)'),
+    ('students', 'idx_students_phone', '(phone)'),
+    ('enrollments', 'idx_enroll_course', '(course_id)'),
+    ('attendance', 'idx_attendance_course_date', '(course_id, `date`)'),
+    ('attendance', 'idx_attendance_date_desc', '(`date` DESC, course_id, student_id)'),
+    ('grades', 'idx_grades_cov', '(course_id, student_id, assessment_id, score)'),
+]
+
 def run_sql():
     with open(SQL_FILE, 'r', encoding='utf-8') as f:
         sql = f.read()
-    # split statements roughly by ';' - pymysql can execute multi statements if needed.
+    # send the whole script in one round trip; the server parses the statements,
+    # so there is no client-side split to cache. (Each DDL statement commits
+    # implicitly in MySQL, so wrapping the script in a transaction would not batch them.)
     try:
-        conn = pymysql.connect(host=config.DB_HOST, user=config.DB_USER, password=config.DB_PASS, port=config.DB_PORT, cursorclass=pymysql.cursors.DictCursor, autocommit=True)
+        conn = pymysql.connect(host=config.DB_HOST, user=config.DB_USER, password=config.DB_PASS, port=config.DB_PORT, cursorclass=pymysql.cursors.DictCursor, autocommit=True,
+                               client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS)
         with conn.cursor() as cur:
-            for stmt in sql.split(';'):
-                s = stmt.strip()
-                if not s:
-                    continue
-                cur.execute(s)
+            cur.execute(sql)
+            while cur.nextset():
+                pass
         print('Database initialized (student_mgmt_db).')
     except Exception as e:
         print('Error initializing DB:', e)
 
+def ensure_indexes():
+    try:
+        conn = pymysql.connect(host=config.DB_HOST, user=config.DB_USER, password=config.DB_PASS, port=config.DB_PORT, db=config.DB_NAME, cursorclass=pymysql.cursors.DictCursor, autocommit=True)
+    except Exception as e:
+        print('Error creating indexes:', e)
+        return
+    try:
+        with conn.cursor() as cur:
+            for table, name, cols in INDEXES:
+                cur.execute("SELECT 1 FROM information_schema.statistics WHERE table_schema=%s AND table_name=%s AND index_name=%s LIMIT 1", (config.DB_NAME, table, name))
+                if cur.fetchone():
+                    continue
+                try:
+                    cur.execute(f"CREATE INDEX {name} ON {table} {cols}")
+                    print('Created index', name)
+                except pymysql.err.MySQLError as e:
+                    print(f'Error creating index {name}:', e)
+    finally:
+        conn.close()
+
 if __name__ == '__main__':
     run_sql()
+    ensure_indexes()
@@ -0,0 +1,31 @@
+# db_pool.py - process-wide PyMySQL connection pool
+import threading
+import pymysql
+from dbutils.pooled_db import PooledDB
+import config
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the shared pool, creating it on first use.
+       Locked because loaders and exports lease connections from worker threads.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # autocommit: plain SELECTs (loaders, exports) run as InnoDB's
+                # auto-commit read-only transactions, with no BEGIN/COMMIT round trips
+                _pool = PooledDB(creator=pymysql, mincached=2, maxcached=5, maxconnections=10, blocking=True,
+                                 host=config.DB_HOST, user=config.DB_USER, password=config.DB_PASS, port=config.DB_PORT,
+                                 db=config.DB_NAME, cursorclass=pymysql.cursors.DictCursor, autocommit=True)
+    return _pool
+
+def get_conn():
+    """Lease a pre-warmed connection; hand it back with release()."""
+    return get_pool().connection()
+
+def release(conn):
+    """Return a leased connection to the pool (closes a non-pooled one)."""
+    conn.close()